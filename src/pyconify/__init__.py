@@ -22,20 +22,61 @@ __all__ = [
     "last_modified",
     "search",
     "svg",
+    "svg_many",
     "svg_path",
 ]
 
-from ._cache import clear_cache, get_cache_directory
-from .api import (
-    collection,
-    collections,
-    css,
-    icon_data,
-    iconify_version,
-    keywords,
-    last_modified,
-    search,
-    svg,
-    svg_path,
-)
-from .freedesktop import freedesktop_theme
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._cache import clear_cache, get_cache_directory
+    from .api import (
+        collection,
+        collections,
+        css,
+        icon_data,
+        iconify_version,
+        keywords,
+        last_modified,
+        search,
+        svg,
+        svg_many,
+        svg_path,
+    )
+    from .freedesktop import freedesktop_theme
+
+# public names are imported lazily (on first access) from these submodules, so that
+# `import pyconify` doesn't import requests or touch the cache directory.
+_LAZY_IMPORTS: dict[str, str] = {
+    "clear_cache": "._cache",
+    "get_cache_directory": "._cache",
+    "collection": ".api",
+    "collections": ".api",
+    "css": ".api",
+    "icon_data": ".api",
+    "iconify_version": ".api",
+    "keywords": ".api",
+    "last_modified": ".api",
+    "search": ".api",
+    "svg": ".api",
+    "svg_many": ".api",
+    "svg_path": ".api",
+    "freedesktop_theme": ".freedesktop",
+}
+# submodules that are also available as attributes (e.g. `pyconify.api`)
+_SUBMODULES = {"_cache", "api", "freedesktop", "iconify_types"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,48 +1,112 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
-from collections.abc import Iterator, MutableMapping
+import re
+import shutil
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from contextlib import suppress
+from functools import lru_cache, update_wrapper
 from pathlib import Path
+from typing import Any, Callable, Generic, TypeVar, cast
+
+F = TypeVar("F", bound=Callable)
+
+# use orjson to parse json, if available
+try:
+    import orjson
+
+    json_loads: Callable[[bytes | str], Any] = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 _SVG_CACHE: MutableMapping[str, bytes] | None = None
+_SVG_CACHE_LOCK = threading.Lock()
+# cache directory, and the last_modified dates recorded in it ({} if outdated) with
+# the time at which they were recorded
+_LAST_MODIFIED_SNAPSHOT: tuple[Path, float, dict[str, int]] | None = None
 PYCONIFY_CACHE: str = os.environ.get("PYCONIFY_CACHE", "")
 CACHE_DISABLED: bool = PYCONIFY_CACHE.lower() in {"0", "false", "no"}
+# storage backend for the svg cache: "files" (default), "sqlite" or "packed"
+PYCONIFY_CACHE_BACKEND: str = os.environ.get("PYCONIFY_CACHE_BACKEND", "").lower()
+# needed on Windows to open files in binary mode with os.open
+_O_BINARY: int = getattr(os, "O_BINARY", 0)
 
 
 def svg_cache() -> MutableMapping[str, bytes]:  # pragma: no cover
     """Return a cache for SVG files."""
-    global _SVG_CACHE
-    if _SVG_CACHE is None:
-        if CACHE_DISABLED:
-            _SVG_CACHE = {}
-        else:
-            try:
-                _SVG_CACHE = _SVGCache()
-            except Exception:
+    global _SVG_CACHE, _LAST_MODIFIED_SNAPSHOT
+    if _SVG_CACHE is not None:
+        return _SVG_CACHE
+    # the first call may come from several threads at once (e.g. svg_many)
+    with _SVG_CACHE_LOCK:
+        if _SVG_CACHE is None:
+            _LAST_MODIFIED_SNAPSHOT = None
+            if CACHE_DISABLED:
                 _SVG_CACHE = {}
-            with suppress(OSError):
-                _delete_stale_svgs(_SVG_CACHE)
-    return _SVG_CACHE
+            else:
+                backend: MutableMapping[str, bytes]
+                try:
+                    if PYCONIFY_CACHE_BACKEND == "sqlite":
+                        backend = _SQLiteSVGCache()
+                    elif PYCONIFY_CACHE_BACKEND == "packed":
+                        backend = _PackedSVGCache()
+                    else:
+                        backend = _SVGCache()
+                except Exception:
+                    backend = {}
+                _start_stale_sweep(backend)
+                _SVG_CACHE = _TieredCache(backend)
+        return _SVG_CACHE
+
+
+def _start_stale_sweep(cache: MutableMapping) -> None:
+    """Sweep stale svgs from `cache` in a background thread.
+
+    The sweep requires a network request, and must not delay icon lookups.
+    """
+    threading.Thread(
+        target=_delete_stale_svgs_safe,
+        args=(cache,),
+        name="pyconify-stale-svg-sweep",
+        daemon=True,
+    ).start()
 
 
 def clear_cache() -> None:
     """Clear the pyconify svg cache."""
-    import shutil
+    from .api import svg_path  # local import: api imports this module
 
-    from .api import svg_path
-
-    shutil.rmtree(get_cache_directory(), ignore_errors=True)
     global _SVG_CACHE
+    if isinstance(_SVG_CACHE, _TieredCache):
+        _SVG_CACHE.flush()
+    backend = getattr(_SVG_CACHE, "backend", None)
+    if isinstance(backend, (_SQLiteSVGCache, _PackedSVGCache)):
+        backend.close()
+    shutil.rmtree(get_cache_directory(), ignore_errors=True)
     _SVG_CACHE = None
-    with suppress(AttributeError):
-        svg_path.cache_clear()
+    svg_path.cache_clear()  # type: ignore[attr-defined]
 
 
 def get_cache_directory(app_name: str = "pyconify") -> Path:
     """Return the pyconify svg cache directory."""
-    if PYCONIFY_CACHE:
-        return Path(PYCONIFY_CACHE).expanduser().resolve()
+    return _cache_directory(app_name, PYCONIFY_CACHE)
+
+
+@lru_cache(maxsize=4)
+def _cache_directory(app_name: str, pyconify_cache: str) -> Path:
+    # memoized on the value of PYCONIFY_CACHE, to avoid repeatedly resolving
+    # the home directory while still honoring changes to the module variable.
+    if pyconify_cache:
+        return Path(pyconify_cache).expanduser().resolve()
 
     if os.name == "posix":
         return Path.home() / ".cache" / app_name
@@ -57,19 +121,182 @@ def get_cache_directory(app_name: str = "pyconify") -> Path:
 DELIM = "_"
 
 
-def cache_key(args: tuple, kwargs: dict, last_modified: int | str) -> str:
-    """Generate a key for the cache based on the function arguments."""
-    _keys: tuple = args
-    if kwargs:
-        for item in sorted(kwargs.items()):
-            if item[1] is not None:
-                _keys += item
-    _keys += (last_modified,)
-    return DELIM.join(map(str, _keys))
+class _TTLCached(Generic[F]):
+    """Wrapper for `func` that memoizes results for `ttl` seconds (see `ttl_cache`)."""
+
+    def __init__(self, func: F, ttl: float, maxsize: int) -> None:
+        self._func = func
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._cache: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        update_wrapper(self, func)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        key = (args, tuple(kwargs.items())) if kwargs else args
+        now = time.monotonic()
+        with self._lock:
+            if (hit := self._cache.get(key)) is not None and now - hit[0] < self._ttl:
+                self._cache.move_to_end(key)
+                return hit[1]
+        result = self._func(*args, **kwargs)
+        with self._lock:
+            self._cache[key] = (now, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return result
+
+    def cache_clear(self) -> None:
+        """Clear the cache."""
+        with self._lock:
+            self._cache.clear()
+
+
+def ttl_cache(ttl: float, maxsize: int = 128) -> Callable[[F], F]:
+    """Like `functools.lru_cache`, but results expire after `ttl` seconds.
+
+    Use for API responses that may change upstream while the process is running.
+    """
+
+    def _decorator(func: F) -> F:
+        return cast("F", _TTLCached(func, ttl, maxsize))
+
+    return _decorator
+
+
+# maximum total size (in bytes) of svgs held in memory in front of the disk cache
+MEMORY_CACHE_MAXBYTES = 4 * 1024 * 1024
+
+
+class _TieredCache(MutableMapping[str, bytes]):
+    """An in-memory LRU cache in front of a (persistent) backend cache.
+
+    Recently used svgs are served from memory without touching the backend. The
+    memory tier is bounded by the total number of bytes it holds, not by the number
+    of entries. Identical svgs stored under different keys (e.g. the same icon
+    requested with different but equivalent parameters) share a single bytes object,
+    and are only counted once.
+    """
+
+    def __init__(
+        self,
+        backend: MutableMapping[str, bytes],
+        maxbytes: int = MEMORY_CACHE_MAXBYTES,
+    ) -> None:
+        super().__init__()
+        self.backend = backend
+        self.maxbytes = maxbytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._nbytes = 0
+        # canonical bytes object for each distinct svg in memory, and its refcount
+        self._shared: dict[bytes, bytes] = {}
+        self._refs: dict[bytes, int] = {}
+        # guards the memory tier, which may be updated from several threads
+        self._lock = threading.Lock()
+        # backend writes that are still in progress (see set_deferred)
+        self._pending: dict[str, Future] = {}
+
+    # the methods below must be called with self._lock held
+
+    def _forget(self, _key: str) -> None:
+        if (old := self._memory.pop(_key, None)) is not None:
+            self._release(old)
+
+    def _release(self, value: bytes) -> None:
+        if refs := self._refs[value] - 1:
+            self._refs[value] = refs
+        else:
+            del self._refs[value], self._shared[value]
+            self._nbytes -= len(value)
+
+    def _remember(self, _key: str, _value: bytes) -> None:
+        with self._lock:
+            self._forget(_key)
+            if len(_value) > self.maxbytes:
+                return
+            _value = self._shared.setdefault(_value, _value)
+            if not (refs := self._refs.get(_value, 0)):
+                self._nbytes += len(_value)
+            self._refs[_value] = refs + 1
+            self._memory[_key] = _value
+            while self._nbytes > self.maxbytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._release(evicted)
+
+    def set_deferred(self, _key: str, _value: bytes) -> None:
+        """Store `_value` in memory now, and in the backend in a background thread.
+
+        The value is available from the cache immediately. Use `wait` (or `flush`) if
+        it must be in the backend.
+        """
+        self._remember(_key, _value)
+        future = _cache_writer().submit(self.backend.__setitem__, _key, _value)
+        with self._lock:
+            self._pending[_key] = future
+        future.add_done_callback(lambda f: self._write_done(_key, f))
+
+    def _write_done(self, _key: str, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(_key) is future:
+                del self._pending[_key]
+
+    def wait(self, _key: str) -> None:
+        """Wait for a deferred write of `_key` to the backend, if there is one."""
+        if (future := self._pending.get(_key)) is not None:
+            wait((future,))
+
+    def flush(self) -> None:
+        """Wait for all deferred writes to the backend."""
+        wait(list(self._pending.values()))
+
+    def __setitem__(self, _key: str, _value: bytes) -> None:
+        self.backend[_key] = _value
+        self._remember(_key, _value)
+
+    def __getitem__(self, _key: str) -> bytes:
+        try:
+            value = self._memory[_key]
+        except KeyError:
+            self.wait(_key)
+            value = self.backend[_key]
+            self._remember(_key, value)
+        else:
+            with self._lock, suppress(KeyError):
+                self._memory.move_to_end(_key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.backend
+
+    def __delitem__(self, _key: str) -> None:
+        self.wait(_key)
+        with self._lock:
+            self._forget(_key)
+        del self.backend[_key]
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def __contains__(self, _key: object) -> bool:
+        return _key in self._memory or _key in self.backend
+
+
+@lru_cache(maxsize=1)
+def _cache_writer() -> ThreadPoolExecutor:
+    """Return the thread pool used for deferred cache writes.
+
+    Pending writes are completed before the interpreter exits.
+    """
+    return ThreadPoolExecutor(2, thread_name_prefix="pyconify-cache-writer")
 
 
 class _SVGCache(MutableMapping[str, bytes]):
-    """A simple directory cache for SVG files."""
+    """A simple directory cache for SVG files.
+
+    Files are sharded into 256 sub-directories (named by the first byte of a hash of
+    the key), so that no single directory grows too large for the filesystem.
+    """
 
     def __init__(self, directory: str | Path | None = None) -> None:
         super().__init__()
@@ -78,42 +305,601 @@ class _SVGCache(MutableMapping[str, bytes]):
         self.path = Path(directory).expanduser().resolve()
         self.path.mkdir(parents=True, exist_ok=True)
         self._extention = ".svg"
+        self._path_str = str(self.path)
+        # in-memory set of cached keys, populated lazily by a directory scan
+        self._known: set[str] | None = None
+        # key without its last_modified date -> newest cached key, built lazily
+        self._stems: dict[str, str] | None = None
+        # guards `_known` and `_stems`, which are updated from several threads
+        self._index_lock = threading.RLock()
+
+    @property
+    def _known_keys(self) -> set[str]:
+        with self._index_lock:
+            if self._known is None:
+                self._known = set(self)
+            return self._known
+
+    def _discard_known(self, _key: str) -> None:
+        with self._index_lock:
+            if self._known is None or _key not in self._known:
+                return
+            self._known.discard(_key)
+            stem = _key.rpartition(DELIM)[0]
+            if self._stems is not None and self._stems.get(stem) == _key:
+                # fall back to the next newest key for this stem (if any)
+                del self._stems[stem]
+                for key in self._known:
+                    if key.startswith(stem) and key.rpartition(DELIM)[0] == stem:
+                        _index_stem(self._stems, key)
+
+    def refresh(self) -> None:
+        """Forget the known keys (e.g. after the directory was modified externally)."""
+        with self._index_lock:
+            self._known = None
+            self._stems = None
+
+    def latest(self, stem: str) -> str | None:
+        """Return the cached key for `stem` with the newest last_modified date.
+
+        `stem` is a cache key without its trailing last_modified date.
+        """
+        with self._index_lock:
+            if self._stems is None:
+                stems: dict[str, str] = {}
+                for key in self._known_keys:
+                    _index_stem(stems, key)
+                self._stems = stems
+            return self._stems.get(stem)
 
     def path_for(self, _key: str) -> Path:
-        return self.path.joinpath(f"{_key}{self._extention}")
+        return Path(self._file_for(_key))
 
-    def _svg_files(self) -> Iterator[Path]:
-        yield from self.path.glob(f"*{self._extention}")
+    def _file_for(self, _key: str) -> str:
+        # plain string paths: avoids building Path objects on the hot path
+        return os.path.join(self._path_str, _bucket(_key), _key + self._extention)
 
     def __setitem__(self, _key: str, _value: bytes) -> None:
-        self.path_for(_key).write_bytes(_value)
+        # write to a temporary file and move it into place, so that concurrent
+        # readers (other threads or processes) never see a partially written file.
+        file = self._file_for(_key)
+        tmp = f"{file}.{os.getpid()}-{threading.get_ident()}.tmp"
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY
+        try:
+            fd = os.open(tmp, flags, 0o644)
+        except FileNotFoundError:
+            # first write to this bucket
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            fd = os.open(tmp, flags, 0o644)
+        try:
+            _write_fd(fd, _value)
+        finally:
+            os.close(fd)
+        os.replace(tmp, file)
+        with self._index_lock:
+            if self._known is not None:
+                self._known.add(_key)
+            if self._stems is not None:
+                _index_stem(self._stems, _key)
 
     def __getitem__(self, _key: str) -> bytes:
         try:
-            return self.path_for(_key).read_bytes()
+            fd = os.open(self._file_for(_key), os.O_RDONLY | _O_BINARY)
         except FileNotFoundError:
+            self._discard_known(_key)
             raise KeyError(_key) from None
+        try:
+            return _read_fd(fd)
+        finally:
+            os.close(fd)
 
     def __iter__(self) -> Iterator[str]:
-        yield from (x.stem for x in self._svg_files())
+        ext_len = len(self._extention)
+        yield from (entry.name[:-ext_len] for entry in self._scan())
 
     def __delitem__(self, _key: str) -> None:
-        self.path_for(_key).unlink()
+        self._discard_known(_key)
+        os.unlink(self._file_for(_key))
 
     def __len__(self) -> int:
-        return len(list(self._svg_files()))
+        return sum(1 for _ in self._scan())
 
     def __contains__(self, _key: object) -> bool:
-        return self.path_for(_key).exists() if isinstance(_key, str) else False
+        with self._index_lock:
+            return _key in self._known_keys
+
+    def _scan(self) -> Iterator[os.DirEntry[str]]:
+        """Yield a directory entry for every svg file in the cache."""
+        with os.scandir(self.path) as buckets:
+            for bucket in buckets:
+                if bucket.is_dir():
+                    with os.scandir(bucket.path) as it:
+                        yield from (e for e in it if e.name.endswith(self._extention))
+
+    def remove_legacy_files(self) -> None:
+        """Remove svgs stored directly in the cache directory by older versions.
+
+        Those files predate the sharded layout and the current key format, so they
+        can never be read again.
+        """
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.name.endswith(self._extention) and entry.is_file():
+                    with suppress(FileNotFoundError):
+                        os.unlink(entry.path)
+
+    def delete_stale(self, last_modified_dates: Mapping[str, int]) -> None:
+        """Unlink all files older than the last_modified date of their prefix.
+
+        Uses a single scan of each bucket directory and unlinks entries directly,
+        rather than going through the MutableMapping interface (which would build a
+        Path per key).
+        """
+        ext_len = len(self._extention)
+        removed: set[str] = set()
+        for entry in self._scan():
+            stem = entry.name[:-ext_len]
+            if (last_mod := last_modified_dates.get(stem.partition(DELIM)[0])) is None:
+                continue
+            with suppress(ValueError):
+                if int(stem.rpartition(DELIM)[2]) < last_mod:
+                    removed.add(stem)
+                    with suppress(FileNotFoundError):
+                        os.unlink(entry.path)
+        if removed:
+            # update the index once, rather than once per removed file
+            with self._index_lock:
+                if self._known is not None:
+                    self._known -= removed
+                self._stems = None
+
+
+def _index_stem(stems: dict[str, str], key: str) -> None:
+    """Record `key` in `stems` if it is the newest key for its stem."""
+    stem = key.rpartition(DELIM)[0]
+    if (current := stems.get(stem)) is None or _key_date(current) < _key_date(key):
+        stems[stem] = key
+
+
+def _key_date(key: str) -> int:
+    """Return the last_modified date at the end of cache `key` (-1 if invalid)."""
+    try:
+        return int(key.rpartition(DELIM)[2])
+    except ValueError:
+        return -1
+
+
+def _read_file_unbuffered(path: str | Path) -> bytes:
+    """Return the contents of the file at `path`, bypassing python's buffered io."""
+    fd = os.open(path, os.O_RDONLY | _O_BINARY)
+    try:
+        return _read_fd(fd)
+    finally:
+        os.close(fd)
+
+
+def _read_fd(fd: int, chunk_size: int = 1 << 20) -> bytes:
+    """Read the remaining contents of file descriptor `fd`."""
+    data = os.read(fd, chunk_size)
+    if len(data) < chunk_size:
+        # svgs are small: the common case is a single read
+        return data
+    chunks = [data]
+    while data := os.read(fd, chunk_size):
+        chunks.append(data)
+    return b"".join(chunks)
+
+
+def _write_fd(fd: int, data: bytes) -> None:
+    """Write all of `data` to file descriptor `fd`."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _bucket(_key: str) -> str:
+    """Return the name of the sub-directory in which to store `_key`."""
+    return hashlib.blake2b(_key.encode(), digest_size=1).hexdigest()
+
+
+class _SQLiteSVGCache(MutableMapping[str, bytes]):
+    """An SVG cache stored in a single SQLite database file.
+
+    The connection is opened lazily on first access and reused thereafter, so each
+    lookup is a single indexed query rather than a file open/read. The database uses
+    write-ahead logging, so it may be shared safely by multiple processes, and the
+    connection is guarded by a lock so it may be shared by multiple threads.
+    """
+
+    def __init__(self, directory: str | Path | None = None) -> None:
+        super().__init__()
+        if not directory:
+            directory = get_cache_directory()  # pragma: no cover
+        self.path = Path(directory).expanduser().resolve()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.path / "svgs.db"
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # wait (rather than fail) if another process holds a write lock
+            conn = sqlite3.connect(
+                self.db_path, timeout=10, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS svgs "
+                "(k TEXT PRIMARY KEY, lm INTEGER, data BLOB)"
+            )
+            self._conn = conn
+        return self._conn
+
+    # database errors (e.g. "database is locked") are raised as a KeyError for reads
+    # and an OSError for writes, like the errors of the other backends.
+
+    def _query(self, sql: str, params: tuple = ()) -> list[Any]:
+        with self._lock:
+            try:
+                return self._db.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                raise KeyError(str(e)) from e
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Execute a statement and return the number of modified rows."""
+        with self._lock:
+            try:
+                return self._db.execute(sql, params).rowcount
+            except sqlite3.Error as e:
+                raise OSError(str(e)) from e
+
+    def close(self) -> None:
+        """Close the database connection (it will be reopened on next access)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def delete_stale(self, last_modified_dates: Mapping[str, int]) -> None:
+        """Delete entries older than the last_modified date of their prefix.
+
+        Uses the `lm` column: one DELETE per prefix, rather than one per stale key.
+        """
+        for prefix, last_mod in last_modified_dates.items():
+            # escape LIKE wildcards (DELIM is one of them)
+            pattern = re.sub(r"([\\%_])", r"\\\1", prefix + DELIM) + "%"
+            self._execute(
+                "DELETE FROM svgs WHERE k LIKE ? ESCAPE '\\' AND lm < ?",
+                (pattern, last_mod),
+            )
+
+    def __setitem__(self, _key: str, _value: bytes) -> None:
+        try:
+            last_mod = int(_key.rpartition(DELIM)[2])
+        except ValueError:
+            last_mod = 0
+        self._execute(
+            "INSERT OR REPLACE INTO svgs (k, lm, data) VALUES (?, ?, ?)",
+            (_key, last_mod, _value),
+        )
+
+    def __getitem__(self, _key: str) -> bytes:
+        if not (rows := self._query("SELECT data FROM svgs WHERE k=?", (_key,))):
+            raise KeyError(_key)
+        return bytes(rows[0][0])
+
+    def __iter__(self) -> Iterator[str]:
+        yield from (row[0] for row in self._query("SELECT k FROM svgs"))
+
+    def __delitem__(self, _key: str) -> None:
+        if not self._execute("DELETE FROM svgs WHERE k=?", (_key,)):
+            raise KeyError(_key)
+
+    def __len__(self) -> int:
+        return int(self._query("SELECT COUNT(*) FROM svgs")[0][0])
+
+    def __contains__(self, _key: object) -> bool:
+        if not isinstance(_key, str):
+            return False
+        return bool(self._query("SELECT 1 FROM svgs WHERE k=? LIMIT 1", (_key,)))
+
+
+class _PackedSVGCache(MutableMapping[str, bytes]):
+    """An append-only SVG cache packed into a single data file.
+
+    All svgs are appended to a data file (`svgs.<generation>.bin`), and a record of
+    `(offset, length, key)` is appended to `svgs.idx` for each write (or a tombstone
+    for each deletion). The index is loaded into memory once, so every lookup is a
+    single positioned read at a known offset. Space taken by deleted entries is
+    reclaimed by `compact()`, which writes the next generation of the data file.
+
+    Because the in-memory index is not synchronized between processes, the cache
+    directory is locked (with `svgs.lock`) for as long as the cache is open. Opening
+    it while another process holds the lock raises an OSError.
+    """
+
+    _HEADER = struct.Struct("<I")  # generation of the data file
+    _RECORD = struct.Struct("<IIH")  # offset, length, key length
+    _TOMBSTONE = 0xFFFFFFFF
+
+    def __init__(self, directory: str | Path | None = None) -> None:
+        super().__init__()
+        if not directory:
+            directory = get_cache_directory()  # pragma: no cover
+        self.path = Path(directory).expanduser().resolve()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.idx_path = self.path / "svgs.idx"
+        self._lock_fd: int | None = _lock_file(self.path / "svgs.lock")
+        self._fd: int | None = None
+        self._lock = threading.RLock()
+        self._index: dict[str, tuple[int, int]] = {}
+        self._generation = 0
+        self.bin_path = self._data_path(0)
+        self._load_index()
+
+    def _data_path(self, generation: int) -> Path:
+        return self.path / f"svgs.{generation}.bin"
+
+    def _load_index(self) -> None:
+        try:
+            data = self.idx_path.read_bytes()
+        except FileNotFoundError:
+            data = b""
+        if len(data) < self._HEADER.size:
+            # a new cache
+            data = self._HEADER.pack(self._generation)
+            self.idx_path.write_bytes(data)
+        (self._generation,) = self._HEADER.unpack_from(data)
+        self.bin_path = self._data_path(self._generation)
+        rec_size, pos = self._RECORD.size, self._HEADER.size
+        while pos + rec_size <= len(data):
+            offset, length, key_len = self._RECORD.unpack_from(data, pos)
+            pos += rec_size
+            key = data[pos : pos + key_len].decode()
+            pos += key_len
+            if length == self._TOMBSTONE:
+                self._index.pop(key, None)
+            else:
+                self._index[key] = (offset, length)
+        # remove files left behind by an interrupted compaction
+        for file in self.path.glob("svgs.*"):
+            if file.suffix in (".bin", ".tmp") and file != self.bin_path:
+                with suppress(FileNotFoundError):
+                    file.unlink()
+
+    def _append_record(self, _key: str, offset: int, length: int) -> None:
+        key = _key.encode()
+        with open(self.idx_path, "ab") as f:
+            f.write(self._RECORD.pack(offset, length, len(key)) + key)
+
+    def _read(self, offset: int, length: int) -> bytes:
+        with self._lock:
+            if self._fd is None:
+                self._fd = os.open(self.bin_path, os.O_RDONLY | _O_BINARY)
+            if hasattr(os, "pread"):
+                return os.pread(self._fd, length, offset)
+            os.lseek(self._fd, offset, os.SEEK_SET)  # pragma: no cover
+            return os.read(self._fd, length)  # pragma: no cover
+
+    def _close_data(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def close(self) -> None:
+        """Close the data file, and release the lock on the cache directory."""
+        with self._lock:
+            self._close_data()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    def compact(self) -> None:
+        """Rewrite the data and index files, dropping deleted entries."""
+        with self._lock:
+            items = [(key, self[key]) for key in list(self._index)]
+            self._close_data()
+            generation = self._generation + 1
+            bin_path = self._data_path(generation)
+            tmp_idx = self.idx_path.with_suffix(".idx.tmp")
+            index: dict[str, tuple[int, int]] = {}
+            with open(bin_path, "wb") as fbin, open(tmp_idx, "wb") as fidx:
+                fidx.write(self._HEADER.pack(generation))
+                for key, value in items:
+                    offset = fbin.tell()
+                    fbin.write(value)
+                    key_bytes = key.encode()
+                    fidx.write(self._RECORD.pack(offset, len(value), len(key_bytes)))
+                    fidx.write(key_bytes)
+                    index[key] = (offset, len(value))
+            # the index names its data file, so this switches both files at once: if
+            # the compaction is interrupted (e.g. at exit, as it may run in a daemon
+            # thread) the previous index and data file are left intact.
+            os.replace(tmp_idx, self.idx_path)
+            old_bin_path, self.bin_path = self.bin_path, bin_path
+            self._generation, self._index = generation, index
+            with suppress(FileNotFoundError):
+                os.unlink(old_bin_path)
+
+    def delete_stale(self, last_modified_dates: Mapping[str, int]) -> None:
+        """Drop entries older than the last_modified date of their prefix."""
+        stale = []
+        for key in self._index:
+            last_mod = last_modified_dates.get(key.partition(DELIM)[0])
+            if last_mod is not None:
+                with suppress(ValueError):
+                    if int(key.rpartition(DELIM)[2]) < last_mod:
+                        stale.append(key)
+        if stale:
+            with self._lock:
+                for key in stale:
+                    self._index.pop(key, None)
+                self.compact()
+
+    def __setitem__(self, _key: str, _value: bytes) -> None:
+        with self._lock:
+            with open(self.bin_path, "ab") as f:
+                f.write(_value)
+                offset = f.tell() - len(_value)
+            self._append_record(_key, offset, len(_value))
+            self._index[_key] = (offset, len(_value))
+
+    def __getitem__(self, _key: str) -> bytes:
+        # hold the lock so that a concurrent compaction can't move the data
+        with self._lock:
+            try:
+                offset, length = self._index[_key]
+            except KeyError:
+                raise KeyError(_key) from None
+            return self._read(offset, length)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._index)
+
+    def __delitem__(self, _key: str) -> None:
+        with self._lock:
+            del self._index[_key]
+            self._append_record(_key, 0, self._TOMBSTONE)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, _key: object) -> bool:
+        return _key in self._index
+
+
+def _lock_file(path: Path) -> int:
+    """Take an exclusive lock on the file at `path` and return its file descriptor.
+
+    The lock is held until the descriptor is closed (or the process exits). Raises
+    OSError if another process holds the lock.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | _O_BINARY, 0o644)
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        raise OSError(f"{path.parent} is in use by another process") from None
+    return fd
+
+
+# name of the file (inside the cache directory) recording the last_modified dates
+# that were current at the time of the last stale-svg sweep.
+LAST_MODIFIED_FILE = "last_modified.json"
+# maximum age (in seconds) of the recorded last_modified dates before the API is
+# queried again
+LAST_MODIFIED_TTL = 24 * 60 * 60
+
+
+def last_modified_snapshot(cache: MutableMapping) -> dict[str, int] | None:
+    """Return the last_modified dates recorded in `cache`, if still fresh.
+
+    This allows cache keys to be built without a network request on startup.
+    Returns None if there is no snapshot, or if it is older than `LAST_MODIFIED_TTL`.
+    Once a snapshot in use becomes outdated, it is refreshed in the background.
+    """
+    global _LAST_MODIFIED_SNAPSHOT
+    backend = getattr(cache, "backend", cache)
+    if (directory := getattr(backend, "path", None)) is None:
+        return None
+    if (snapshot := _LAST_MODIFIED_SNAPSHOT) is None or snapshot[0] != directory:
+        recorded, dates = 0.0, {}
+        with suppress(OSError):
+            recorded = os.stat(directory / LAST_MODIFIED_FILE).st_mtime
+        if time.time() - recorded < LAST_MODIFIED_TTL:
+            dates = _read_last_modified(directory)
+        snapshot = _LAST_MODIFIED_SNAPSHOT = (directory, recorded, dates)
+    elif snapshot[2] and time.time() - snapshot[1] >= LAST_MODIFIED_TTL:
+        # outdated in a long-running process: the API is used until the sweep has
+        # recorded the current dates (which also updates the snapshot)
+        _LAST_MODIFIED_SNAPSHOT = None
+        _start_stale_sweep(backend)
+        return None
+    return snapshot[2] or None
+
+
+def _last_modified_is_fresh(directory: Path) -> bool:
+    """Return True if the last_modified dates in `directory` are recent enough."""
+    try:
+        mtime = os.stat(directory / LAST_MODIFIED_FILE).st_mtime
+    except OSError:
+        return False
+    return time.time() - mtime < LAST_MODIFIED_TTL
+
+
+def _read_last_modified(directory: Path) -> dict[str, int]:
+    """Return the last_modified dates recorded in `directory`, or an empty dict."""
+    with suppress(OSError, ValueError):
+        content = json_loads((directory / LAST_MODIFIED_FILE).read_bytes())
+        if isinstance(content, dict):
+            return content
+    return {}
+
+
+def _write_last_modified(directory: Path, dates: Mapping[str, int]) -> None:
+    """Record the last_modified `dates` in `directory`."""
+    (directory / LAST_MODIFIED_FILE).write_text(json.dumps(dates))
+
+
+# prevents concurrent sweeps of the same cache (e.g. after clear_cache())
+_SWEEP_LOCK = threading.Lock()
+
+
+def _delete_stale_svgs_safe(cache: MutableMapping) -> None:  # pragma: no cover
+    """Remove stale svgs from `cache`, ignoring network and file errors.
+
+    Files left behind by older versions of pyconify are always removed; stale svgs
+    are not looked for if the cache was swept less than `LAST_MODIFIED_TTL` ago.
+    """
+    if isinstance(cache, _SVGCache):
+        with suppress(OSError):
+            cache.remove_legacy_files()
+    directory: Path | None = getattr(cache, "path", None)
+    if directory is not None and _last_modified_is_fresh(directory):
+        return
+    with _SWEEP_LOCK, suppress(OSError, ValueError):
+        _delete_stale_svgs(cache)
 
 
 def _delete_stale_svgs(cache: MutableMapping) -> None:  # pragma: no cover
-    """Remove all SVG files with an outdated last_modified date from the cache."""
+    """Remove all SVG files with an outdated last_modified date from the cache.
+
+    Only prefixes whose last_modified date increased since the previous sweep (as
+    recorded in the cache directory) are considered. If nothing changed upstream,
+    the cache is not scanned at all, but the recorded dates (and the snapshot used
+    to build cache keys) are still refreshed.
+    """
+    global _LAST_MODIFIED_SNAPSHOT
     from .api import last_modified
 
     last_modified_dates = last_modified()
-    for key in list(cache):
-        with suppress(ValueError):
-            prefix, *_, cached_last_mod = key.split(DELIM)
-            if int(cached_last_mod) < last_modified_dates.get(prefix, 0):
-                del cache[key]
+    directory: Path | None = getattr(cache, "path", None)
+    previous = _read_last_modified(directory) if directory else {}
+    changed = {
+        prefix: last_mod
+        for prefix, last_mod in last_modified_dates.items()
+        if last_mod > previous.get(prefix, 0)
+    }
+    if changed and isinstance(cache, (_SVGCache, _SQLiteSVGCache, _PackedSVGCache)):
+        cache.delete_stale(changed)
+    elif changed:
+        for key in list(cache):
+            if (last_mod := changed.get(key.partition(DELIM)[0])) is None:
+                continue
+            with suppress(ValueError):
+                if int(key.rpartition(DELIM)[2]) < last_mod:
+                    del cache[key]
+    if directory:
+        _write_last_modified(directory, last_modified_dates)
+        _LAST_MODIFIED_SNAPSHOT = (directory, time.time(), dict(last_modified_dates))
@@ -4,18 +4,33 @@ from __future__ import annotations
 
 import atexit
 import functools
+import hashlib
 import os
 import re
+import sys
 import tempfile
 import warnings
 from contextlib import suppress
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal, overload
 
-from ._cache import CACHE_DISABLED, _SVGCache, cache_key, svg_cache
+from ._cache import (
+    CACHE_DISABLED,
+    DELIM,
+    _read_file_unbuffered,
+    _read_last_modified,
+    _SVGCache,
+    _TieredCache,
+    _write_fd,
+    json_loads,
+    last_modified_snapshot,
+    svg_cache,
+    ttl_cache,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Sequence
+    from concurrent.futures import ThreadPoolExecutor
     from typing import Callable, TypeVar
 
     import requests
@@ -34,19 +49,55 @@ if TYPE_CHECKING:
 
 
 ROOT = "https://api.iconify.design"
+_URL_COLLECTIONS = f"{ROOT}/collections"
+_URL_COLLECTION = f"{ROOT}/collection"
+_URL_LAST_MODIFIED = f"{ROOT}/last-modified"
+_URL_SEARCH = f"{ROOT}/search"
+_URL_KEYWORDS = f"{ROOT}/keywords"
+_URL_VERSION = f"{ROOT}/version"
+# timeout (in seconds) for all requests to the iconify API
+TIMEOUT = 2
+# time (in seconds) for which icon set metadata is reused before it is fetched again
+METADATA_TTL = 60 * 60
 
 
 @functools.cache
 def _session() -> requests.Session:
-    """Return a requests session."""
+    """Return the requests session shared by all API calls.
+
+    The session keeps connections to the API host alive between calls, so only the
+    first request pays for the TCP and TLS handshakes.
+    """
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    from . import __version__
 
     session = requests.Session()
-    session.headers.update({"User-Agent": "pyconify"})
+    # Accept-Encoding is left to requests: it only offers br if brotli is installed
+    session.headers.update({"User-Agent": f"pyconify/{__version__}"})
+    # retry transient server errors with exponential backoff. Once retries are
+    # exhausted, the last response is returned (and handled) as usual. Connection
+    # errors are not retried, so that offline use doesn't wait on backoff. Retry-After
+    # headers are ignored: they may ask for a wait far beyond TIMEOUT.
+    retry = Retry(
+        total=3,
+        connect=0,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    # enough pooled connections for bursts of concurrent downloads (see svg_many)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=32)
+    session.mount("https://", adapter)
+    atexit.register(session.close)
     return session
 
 
-@functools.cache
+@ttl_cache(METADATA_TTL)
 def collections(*prefixes: str) -> dict[str, IconifyInfo]:
     """Return collections where key is icon set prefix, value is IconifyInfo object.
 
@@ -62,12 +113,12 @@ def collections(*prefixes: str) -> dict[str, IconifyInfo]:
         end with "-", such as "mdi-" matches "mdi-light".
     """
     query_params = {"prefixes": ",".join(prefixes)}
-    resp = _session().get(f"{ROOT}/collections", params=query_params, timeout=2)
+    resp = _session().get(_URL_COLLECTIONS, params=query_params, timeout=TIMEOUT)
     resp.raise_for_status()
-    return resp.json()  # type: ignore
+    return json_loads(resp.content)  # type: ignore
 
 
-@functools.cache
+@ttl_cache(METADATA_TTL, maxsize=256)
 def collection(
     prefix: str,
     info: bool = False,
@@ -88,24 +139,22 @@ def collection(
         exists only in icon sets that were imported from icon fonts.
     """
     # https://api.iconify.design/collection?prefix=line-md&pretty=1
-    query_params = {}
+    query_params: dict = {"prefix": prefix}
     if chars:
         query_params["chars"] = 1
     if info:
         query_params["info"] = 1
-    resp = _session().get(
-        f"{ROOT}/collection?prefix={prefix}", params=query_params, timeout=2
-    )
+    resp = _session().get(_URL_COLLECTION, params=query_params, timeout=TIMEOUT)
     if 400 <= resp.status_code < 500:
         raise OSError(
             f"Icon set {prefix!r} not found. "
             "Search for icons at https://icon-sets.iconify.design",
         )
     resp.raise_for_status()
-    return resp.json()  # type: ignore
+    return json_loads(resp.content)  # type: ignore
 
 
-@functools.cache
+@ttl_cache(METADATA_TTL)
 def last_modified(*prefixes: str) -> dict[str, int]:
     """Return last modified date for icon sets.
 
@@ -128,13 +177,14 @@ def last_modified(*prefixes: str) -> dict[str, int]:
         UTC integer timestamp.
     """
     query_params = {"prefixes": ",".join(prefixes)}
-    resp = _session().get(f"{ROOT}/last-modified", params=query_params, timeout=2)
+    resp = _session().get(_URL_LAST_MODIFIED, params=query_params, timeout=TIMEOUT)
     resp.raise_for_status()
-    if "lastModified" not in (content := resp.json()):  # pragma: no cover
+    if "lastModified" not in (content := json_loads(resp.content)):  # pragma: no cover
         raise ValueError(
             f"Unexpected response from API: {content}. Expected 'lastModified'."
         )
-    return content["lastModified"]  # type: ignore
+    # intern prefixes: they are used as keys in many lookups
+    return {sys.intern(k): v for k, v in content["lastModified"].items()}
 
 
 # this function uses a special cache inside the body of the function
@@ -188,79 +238,299 @@ def svg(
         pixels and icon's group ends up being smaller than actual icon, making it harder
         to align it in design.
     """
-    # check cache
-    prefix, name, svg_cache_key = _svg_keys(key, locals())
+    prefix, name, svg_cache_key = _svg_keys(
+        key, color=color, height=height, width=width, flip=flip, rotate=rotate, box=box
+    )
+    return _svg_impl(
+        prefix,
+        name,
+        svg_cache_key,
+        color=color,
+        height=height,
+        width=width,
+        flip=flip,
+        rotate=rotate,
+        box=box,
+    )
+
+
+def _svg_impl(
+    prefix: str,
+    name: str,
+    svg_cache_key: str,
+    *,
+    color: str | None = None,
+    height: str | int | None = None,
+    width: str | int | None = None,
+    flip: Flip | None = None,
+    rotate: Rotation | None = None,
+    box: bool | None = None,
+) -> bytes:
+    """Return SVG for `prefix:name` from the cache, or download (and cache) it."""
+    if (cached := _cached_svg(svg_cache_key)) is not None:
+        return cached
+
+    # if an older version is cached, only download the svg if it has changed since
+    headers = {}
+    if stale := _stale_svg(svg_cache_key):
+        from email.utils import formatdate
+
+        headers["If-Modified-Since"] = formatdate(stale[1], usegmt=True)
+    resp = _svg_request(
+        prefix,
+        name,
+        color=color,
+        height=height,
+        width=width,
+        flip=flip,
+        rotate=rotate,
+        box=box,
+        headers=headers,
+    )
+    content = stale[0] if stale and resp.status_code == 304 else resp.content
+
+    # cache response and return
+    cache = svg_cache()
+    if isinstance(cache, _TieredCache):
+        # don't make the caller wait for the disk write
+        cache.set_deferred(svg_cache_key, content)
+    else:
+        cache[svg_cache_key] = content
+    return content
+
 
-    if svg_cache_key in (cache := svg_cache()):
-        return cache[svg_cache_key]
+def _cached_svg(svg_cache_key: str) -> bytes | None:
+    """Return the cached SVG for `svg_cache_key`, or None if it's not cached."""
+    with suppress(KeyError):
+        return svg_cache()[svg_cache_key]
     if path := _cached_svg_path(svg_cache_key):
         # this will catch cases offline cases where last_modified is not available
-        return path.read_bytes()
+        return _read_file_unbuffered(path)
+    return None
 
-    if rotate not in (None, 1, 2, 3):
-        rotate = str(rotate).replace("deg", "") + "deg"  # type: ignore
-    query_params = {
-        "color": color,
-        "height": height,
-        "width": width,
-        "flip": flip,
-        "rotate": rotate,
-    }
+
+def _stale_svg(svg_cache_key: str) -> tuple[bytes, float] | None:
+    """Return an older cached version of an svg, and its modification time.
+
+    The older version is looked for under the last_modified date recorded at the last
+    stale-svg sweep. Returns None if there is no older version, or if the cache
+    doesn't store files.
+    """
+    cache = svg_cache()
+    backend = cache.backend if isinstance(cache, _TieredCache) else cache
+    if not isinstance(backend, _SVGCache):
+        return None
+    stem, _, last_mod = svg_cache_key.rpartition(DELIM)
+    recorded = _read_last_modified(backend.path).get(stem.partition(DELIM)[0])
+    if recorded is None or str(recorded) == last_mod:
+        return None
+    path = backend.path_for(DELIM.join((stem, str(recorded))))
+    try:
+        return _read_file_unbuffered(path), os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _svg_request(
+    prefix: str,
+    name: str,
+    *,
+    color: str | None = None,
+    height: str | int | None = None,
+    width: str | int | None = None,
+    flip: Flip | None = None,
+    rotate: Rotation | None = None,
+    box: bool | None = None,
+    stream: bool = False,
+    headers: dict[str, str] | None = None,
+) -> requests.Response:
+    """Request SVG for `prefix:name` from the API, raising OSError if not found."""
+    values = (color, height, width, flip, _rotate_param(rotate))
+    query_params = {k: v for k, v in zip(SVG_QUERY_PARAMS, values) if v is not None}
     if box:
         query_params["box"] = 1
-    resp = _session().get(f"{ROOT}/{prefix}/{name}.svg", params=query_params, timeout=2)
+    resp = _session().get(
+        f"{ROOT}/{prefix}/{name}.svg",
+        params=query_params,
+        timeout=TIMEOUT,
+        stream=stream,
+        headers=headers,
+    )
     if 400 <= resp.status_code < 500:
+        resp.close()
         raise OSError(
             f"Icon '{prefix}:{name}' not found. "
             f"Search for icons at https://icon-sets.iconify.design?query={name}",
         )
     resp.raise_for_status()
-
-    # cache response and return
-    cache[svg_cache_key] = resp.content
-    return resp.content
+    return resp
 
 
 NO_LAST_MOD = "000"
+# svg() parameters that affect the cache key, in the (sorted) order used in the key
+SVG_PARAMS = ("box", "color", "flip", "height", "rotate", "width")
+# svg() parameters that are passed through to the API as query parameters
+SVG_QUERY_PARAMS = ("color", "height", "width", "flip", "rotate")
+# valid values for "flip" (in the normalized order used in cache keys)
+VALID_FLIPS = frozenset({"horizontal", "vertical", "horizontal,vertical"})
+# "rotate" query parameter for common rotations given in degrees
+ROTATE_PARAMS: dict[str | int, str] = {
+    k: f"{deg}deg" for deg in (90, 180, 270, -90) for k in (deg, str(deg), f"{deg}deg")
+}
+
+
+def _rotate_param(rotate: Rotation | None) -> str | int | None:
+    """Return the "rotate" query parameter for `rotate`.
+
+    Integers 1, 2 and 3 are quarter turns, anything else is in degrees.
+    """
+    if rotate is None or rotate in (1, 2, 3):
+        return rotate
+    if (param := ROTATE_PARAMS.get(rotate)) is not None:
+        return param
+    if isinstance(rotate, str) and rotate.endswith("deg"):
+        return rotate
+    return f"{rotate}deg"
 
 
-def _svg_keys(args: tuple, kwargs: dict) -> tuple[str, str, str]:
+# css() parameters that are passed through to the API as query parameters
+CSS_PARAMS = ("selector", "common", "override", "var", "color", "mode", "format")
+# comments added by the API to css responses for unknown icons
+MISSING_ICON = "Could not find icon:"
+MISSING_ICON_RE = re.compile(rf"{MISSING_ICON} (\S*) ")
+
+
+def _svg_keys(
+    args: tuple,
+    *,
+    color: str | None = None,
+    height: str | int | None = None,
+    width: str | int | None = None,
+    flip: Flip | None = None,
+    rotate: Rotation | None = None,
+    box: bool | None = None,
+) -> tuple[str, str, str]:
     prefix, name = _split_prefix_name(args)
     try:
         # important not to rely on internet when looking for cached file
-        last_mod = last_modified().get(prefix, NO_LAST_MOD)
+        dates = last_modified_snapshot(svg_cache()) or last_modified()
+        last_mod = dates.get(prefix, NO_LAST_MOD)
     except OSError:
         last_mod = NO_LAST_MOD
 
-    _kwargs = {
-        k: v
-        for k, v in kwargs.items()
-        if k in {"color", "height", "width", "flip", "rotate", "box"}
-    }
-    svg_cache_key = cache_key((prefix, name), _kwargs, last_mod)
+    # normalize equivalent parameters, so that they share a cache entry
+    # (e.g. rotate=90, rotate="90" and rotate="90deg"; or color="#FFF" and "#fff")
+    color_key = color.lower() if color and color.startswith("#") else color
+    flip_key = ",".join(sorted(flip.replace(" ", "").split(","))) if flip else flip
+    if flip and flip_key not in VALID_FLIPS:
+        raise ValueError(f"Invalid flip {flip!r}. Must be one of {sorted(VALID_FLIPS)}")
+    values = (box or None, color_key, flip_key, height, _rotate_param(rotate), width)
+
+    # keys have a fixed layout and length: `{prefix}_{digest}_{last_mod}`, where
+    # the digest covers the icon name and parameters. The prefix and last_modified
+    # date are kept in the clear for stale-svg sweeps and offline fallbacks.
+    # The digested string (`{name}_{param}_{value}..._`, skipping None values) must
+    # not change, or all existing cache entries are invalidated.
+    parts = [name]
+    for k, v in zip(SVG_PARAMS, values):
+        if v is not None:
+            parts += (k, str(v))
+    parts.append("")
+    digest = hashlib.blake2b(DELIM.join(parts).encode(), digest_size=16).hexdigest()
+    svg_cache_key = DELIM.join((prefix, digest, str(last_mod)))
     return prefix, name, svg_cache_key
 
 
+# maximum number of concurrent downloads in svg_many()
+SVG_MANY_WORKERS = 8
+
+
+@functools.cache
+def _executor() -> ThreadPoolExecutor:
+    """Return the thread pool used to download svgs concurrently."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    return ThreadPoolExecutor(SVG_MANY_WORKERS, thread_name_prefix="pyconify")
+
+
+def svg_many(
+    keys: Iterable[str | Sequence[str]],
+    *,
+    color: str | None = None,
+    height: str | int | None = None,
+    width: str | int | None = None,
+    flip: Flip | None = None,
+    rotate: Rotation | None = None,
+    box: bool | None = None,
+) -> list[bytes]:
+    """Generate SVGs for many icons at once.
+
+    Equivalent to `[svg(key, ...) for key in keys]`, but icons that are not in the
+    cache are downloaded concurrently.
+
+    Parameters
+    ----------
+    keys : Iterable[str | Sequence[str]]
+        Icon keys. Each key may be a single string in the format `"prefix:name"` or a
+        sequence of two strings: `('prefix', 'name')`.
+    color, height, width, flip, rotate, box
+        Applied to all icons. See `svg()` for details.
+
+    Returns
+    -------
+    list[bytes]
+        SVG data for each key, in the same order as `keys`.
+    """
+    opts: dict = {
+        "color": color,
+        "height": height,
+        "width": width,
+        "flip": flip,
+        "rotate": rotate,
+        "box": box,
+    }
+    cache = svg_cache()
+    results: list[bytes] = []
+    missing: dict[int, tuple[str, str, str]] = {}
+    for idx, key in enumerate(keys):
+        _key = (key,) if isinstance(key, str) else tuple(key)
+        prefix, name, svg_cache_key = _svg_keys(_key, **opts)
+        try:
+            results.append(cache[svg_cache_key])
+        except KeyError:
+            results.append(b"")
+            missing[idx] = (prefix, name, svg_cache_key)
+    if missing:
+        pool = _executor()
+        futures = {
+            idx: pool.submit(_svg_impl, *keys_, **opts)
+            for idx, keys_ in missing.items()
+        }
+        for idx, future in futures.items():
+            results[idx] = future.result()
+    return results
+
+
 def _cached_svg_path(svg_cache_key: str) -> Path | None:
     """Return path to existing SVG file for `key` or None."""
     cache = svg_cache()
+    if isinstance(cache, _TieredCache):
+        cache.wait(svg_cache_key)
+        cache = cache.backend
     if isinstance(cache, _SVGCache):
         if (path := cache.path_for(svg_cache_key)).is_file():
             return path
-        if svg_cache_key.endswith(NO_LAST_MOD):
-            # if the last modified date is not available, try to find a file with any
-            # last modified date
-            key_stem = svg_cache_key.split(NO_LAST_MOD, 1)[0]
-            for existing_key in cache:
-                if (
-                    existing_key.startswith(key_stem)
-                    and (path := cache.path_for(existing_key)).is_file()
-                ):
-                    return path
+        if svg_cache_key.rpartition(DELIM)[2] == NO_LAST_MOD:
+            # if the last modified date is not available, use the file with the
+            # newest last modified date
+            key_stem = svg_cache_key.rpartition(DELIM)[0]
+            if (existing_key := cache.latest(key_stem)) and (
+                path := cache.path_for(existing_key)
+            ).is_file():
+                return path
     return None  # pragma: no cover
 
 
-@functools.cache
 def svg_path(
     *key: str,
     color: str | None = None,
@@ -274,7 +544,7 @@ def svg_path(
     """Similar to `svg` but returns a path to SVG file for `key`.
 
     Arguments are the same as for `pyconfify.api.svg()` except for `dir` which is the
-    directory to save the SVG file to (it will be passed to `tempfile.mkstemp`).
+    directory to save the SVG file to.
 
     If `dir` is specified, the SVG will be downloaded to a temporary file in that
     directory, and the path to that file will be returned. The temporary file will be
@@ -283,51 +553,137 @@ def svg_path(
     If `dir` is `None` and caching is enabled (the default), the SVG will be downloaded
     and cached to disk and the path to the cached file will be returned. If `dir` is
     `None` and caching is disabled (by setting the `PYCONIFY_CACHE` environment variable
-    to `'0'` before import), a temporary file will be created (using `tempfile.mkstemp`)
+    to `'0'` before import), a temporary file will be created in a temporary directory
     and the path to that file will be returned.
 
+    Temporary files are named after a hash of their content (e.g.
+    `pyconify_bi-alarm_<hash>.svg`), so identical SVGs share a single file.
+
     As with `pyconfify.api.svg`, calls to `svg_path` result in SVGs being cached to
     disk. To disable caching, set the `PYCONIFY_CACHE` environment variable to `0`
     (before importing pyconify). To customize the location of the cache, set the
     `PYCONIFY_CACHE` environment variable to the path of the desired cache directory.
     To reveal the location of the cache, use `pyconify.get_cache_directory()`.
     """
+    # normalize arguments, so that equivalent calls share a cache entry
+    prefix, name = _split_prefix_name(key)
+    return _svg_path(
+        prefix,
+        name,
+        color,
+        height,
+        width,
+        flip,
+        rotate,
+        box,
+        None if dir is None else str(dir),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _svg_path(
+    prefix: str,
+    name: str,
+    color: str | None,
+    height: str | int | None,
+    width: str | int | None,
+    flip: Flip | None,
+    rotate: Rotation | None,
+    box: bool | None,
+    dir: str | None,
+) -> Path:
+    opts: dict = {
+        "color": color,
+        "height": height,
+        "width": width,
+        "flip": flip,
+        "rotate": rotate,
+        "box": box,
+    }
+    *_, svg_cache_key = _svg_keys((prefix, name), **opts)
     # if there is no request to store outside cache
     # and default cache is not disabled then get it from cache
-    if dir is None:
-        *_, svg_cache_key = _svg_keys(key, locals())
+    if dir is None and (path := _cached_svg_path(svg_cache_key)):
+        # if it exists return that string
+        # if cache is disabled globally, this will always be None
+        return path
+
+    if dir is None and not CACHE_DISABLED:
+        # download it into the cache, and return the path to the cached file.
+        # (with a cache backend other than files, this will still be None and we
+        # proceed with creating a temporary file)
+        _svg_impl(prefix, name, svg_cache_key, **opts)
         if path := _cached_svg_path(svg_cache_key):
-            # if it exists return that string
-            # if cache is disabled globally, this will always be None
             return path
 
-    # otherwise, we need to download it and save it to a temporary file
-    svg_bytes = svg(
-        *key, color=color, height=height, width=width, flip=flip, rotate=rotate, box=box
-    )
-    if dir is None and not CACHE_DISABLED and (path := _cached_svg_path(svg_cache_key)):
-        # if the first hit failed, then the call to svg() will have cached the result
-        # and we can now return it.
-        # if cache is disabled globally, this will still be None and we proceed with
-        # creating a temporary file
-        return path
+    # otherwise, save it to a temporary file
+    file_prefix = f"pyconify_{prefix}-{name}".replace(":", "-")
+    if (svg_bytes := _cached_svg(svg_cache_key)) is not None:
+        return _write_tmp_svg(file_prefix, dir, (svg_bytes,))
+    # stream the download straight into the file, without holding it in memory
+    with _svg_request(prefix, name, stream=True, **opts) as resp:
+        return _write_tmp_svg(file_prefix, dir, resp.iter_content(1 << 16))
 
-    # make a temporary file
-    file_prefix = f"pyconify_{'-'.join(key)}".replace(":", "-")
-    fd, tmp_name = tempfile.mkstemp(prefix=file_prefix, suffix=".svg", dir=dir)
-    with os.fdopen(fd, "wb") as f:
-        f.write(svg_bytes)
 
-    # cleanup the temporary file when the program exits
-    @atexit.register
-    def _remove_tmp_svg() -> None:
-        with suppress(FileNotFoundError):  # pragma: no cover
-            os.remove(tmp_name)
+# svg_path() is memoized by _svg_path(): expose the functools.cache interface
+svg_path.cache_clear = _svg_path.cache_clear  # type: ignore[attr-defined]
+svg_path.cache_info = _svg_path.cache_info  # type: ignore[attr-defined]
 
-    return Path(tmp_name)
+
+# temporary svg files written by svg_path() outside of `_tmp_dir()`,
+# removed when the program exits
+_TMP_SVGS: list[str] = []
+
+
+@atexit.register
+def _remove_tmp_svgs() -> None:
+    while _TMP_SVGS:
+        with suppress(FileNotFoundError):  # pragma: no cover
+            os.remove(_TMP_SVGS.pop())
 
 
 @functools.cache
+def _tmp_dir() -> str:
+    """Return the temporary directory for svg_path() files, removed at exit."""
+    import shutil
+
+    tmp_dir = tempfile.mkdtemp(prefix="pyconify-")
+    atexit.register(shutil.rmtree, tmp_dir, ignore_errors=True)
+    return tmp_dir
+
+
+def _write_tmp_svg(prefix: str, dir: str | None, chunks: Iterable[bytes]) -> Path:
+    """Write `chunks` to a temporary file, which is removed at exit.
+
+    Files are named after a hash of their content, so identical svgs are only
+    written once.
+    """
+    directory = dir or _tmp_dir()
+    digest = hashlib.blake2b(digest_size=8)
+    fd, tmp_name = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+    try:
+        try:
+            for chunk in chunks:
+                digest.update(chunk)
+                _write_fd(fd, chunk)
+        finally:
+            os.close(fd)
+    except BaseException:
+        # e.g. a network error in the middle of a streamed download
+        os.remove(tmp_name)
+        raise
+
+    path = os.path.join(directory, f"{prefix}_{digest.hexdigest()}.svg")
+    if os.path.exists(path):
+        os.remove(tmp_name)
+    else:
+        os.replace(tmp_name, path)
+        if dir is not None:
+            _TMP_SVGS.append(path)
+    return Path(path)
+
+
+@ttl_cache(METADATA_TTL, maxsize=4096)
 def css(
     *keys: str,
     selector: str | None = None,
@@ -386,32 +742,36 @@ def css(
         are "expanded", "compact" and "compressed".
     """
     prefix, icons = _split_prefix_name(keys, allow_many=True)
-    params: dict = {}
-
-    for k in ("selector", "common", "override", "var", "color", "mode", "format"):
-        if (val := locals()[k]) is not None:
-            params[k] = val
+    values = (selector, common, override, var, color, mode, format)
+    params: dict = {k: v for k, v in zip(CSS_PARAMS, values) if v is not None}
     if pseudo:
         params["pseudo"] = 1
     if square:
         params["square"] = 1
 
-    resp = _session().get(
-        f"{ROOT}/{prefix}.css?icons={','.join(icons)}", params=params, timeout=2
-    )
-    if 400 <= resp.status_code < 500:
-        raise OSError(
-            f"Icon set {prefix!r} not found. "
-            "Search for icons at https://icon-sets.iconify.design",
+    texts = []
+    for chunk in _chunk_icons(icons):
+        resp = _session().get(
+            f"{ROOT}/{prefix}.css?icons={chunk}", params=params, timeout=TIMEOUT
         )
-    resp.raise_for_status()
-    if missing := set(re.findall(r"Could not find icon: ([^\s]*) ", resp.text)):
+        if 400 <= resp.status_code < 500:
+            raise OSError(
+                f"Icon set {prefix!r} not found. "
+                "Search for icons at https://icon-sets.iconify.design",
+            )
+        resp.raise_for_status()
+        texts.append(resp.text)
+    text = "\n".join(texts)
+    # cheap substring check first: most responses have no missing icons
+    if MISSING_ICON in text and (
+        missing := {m.group(1) for m in MISSING_ICON_RE.finditer(text)}
+    ):
         warnings.warn(
             f"Icon(s) {sorted(missing)} not found. "
             "Search for icons at https://icon-sets.iconify.design",
-            stacklevel=2,
+            stacklevel=3,  # skip the ttl_cache wrapper, to point at the caller
         )
-    return resp.text
+    return text
 
 
 def icon_data(*keys: str) -> IconifyJSON:
@@ -433,16 +793,56 @@ def icon_data(*keys: str) -> IconifyJSON:
         Icon name(s).
     """
     prefix, names = _split_prefix_name(keys, allow_many=True)
-    resp = _session().get(f"{ROOT}/{prefix}.json?icons={','.join(names)}", timeout=2)
-    if (content := resp.json()) == 404:
-        raise OSError(
-            f"Icon set {prefix!r} not found. "
-            "Search for icons at https://icon-sets.iconify.design",
-        )
-    resp.raise_for_status()
+    content: dict = {}
+    for chunk in _chunk_icons(names):
+        resp = _session().get(f"{ROOT}/{prefix}.json?icons={chunk}", timeout=TIMEOUT)
+        # the API answers unknown icon sets with a body of `404`
+        # (bytes comparison is cheap: lengths are compared first)
+        if resp.status_code == 404 or resp.content == b"404":
+            raise OSError(
+                f"Icon set {prefix!r} not found. "
+                "Search for icons at https://icon-sets.iconify.design",
+            )
+        resp.raise_for_status()
+        data = json_loads(resp.content)
+        if not content:
+            content = data
+            continue
+        # merge the response for this chunk into the first one
+        for k in ("icons", "aliases"):
+            if k in data:
+                content.setdefault(k, {}).update(data[k])
+        if "not_found" in data:
+            content.setdefault("not_found", []).extend(data["not_found"])
     return content  # type: ignore
 
 
+# maximum length of the comma-separated icon names in a single request url
+MAX_ICONS_QUERY_LEN = 2000
+
+
+def _chunk_icons(names: tuple[str, ...]) -> list[str]:
+    """Split `names` into comma-separated lists that fit in a request url.
+
+    Examples
+    --------
+    >>> _chunk_icons(("account", "home"))
+    ['account,home']
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for name in names:
+        if current and size + len(name) > MAX_ICONS_QUERY_LEN:
+            chunks.append(",".join(current))
+            current, size = [], 0
+        current.append(name)
+        size += len(name) + 1
+    if current:
+        chunks.append(",".join(current))
+    return chunks
+
+
 def search(
     query: str,
     limit: int | None = None,
@@ -494,21 +894,23 @@ def search(
     category : str, optional
         Filter icon sets by category.
     """
-    params: dict = {}
-    if limit is not None:
-        params["limit"] = limit
-    if start is not None:
-        params["start"] = start
-    if prefixes is not None:
-        if isinstance(prefixes, str):
-            params["prefix"] = prefixes
-        else:
-            params["prefixes"] = ",".join(prefixes)
-    if category is not None:
-        params["category"] = category
-    resp = _session().get(f"{ROOT}/search?query={query}", params=params, timeout=2)
+    prefix_key = "prefix"
+    if prefixes is not None and not isinstance(prefixes, str):
+        prefix_key, prefixes = "prefixes", ",".join(prefixes)
+    params = {
+        k: v
+        for k, v in (
+            ("query", query),
+            ("limit", limit),
+            ("start", start),
+            (prefix_key, prefixes),
+            ("category", category),
+        )
+        if v is not None
+    }
+    resp = _session().get(_URL_SEARCH, params=params, timeout=TIMEOUT)
     resp.raise_for_status()
-    return resp.json()  # type: ignore
+    return json_loads(resp.content)  # type: ignore
 
 
 def keywords(
@@ -543,12 +945,12 @@ def keywords(
         params = {"keyword": keyword}
     else:
         params = {}
-    resp = _session().get(f"{ROOT}/keywords", params=params, timeout=2)
+    resp = _session().get(_URL_KEYWORDS, params=params, timeout=TIMEOUT)
     resp.raise_for_status()
-    return resp.json()  # type: ignore
+    return json_loads(resp.content)  # type: ignore
 
 
-@functools.cache
+@ttl_cache(METADATA_TTL, maxsize=1)
 def iconify_version() -> str:
     """Return version of iconify API.
 
@@ -563,7 +965,7 @@ def iconify_version() -> str:
     >>> iconify_version()
     'Iconify API version 3.0.0-beta.1'
     """
-    resp = _session().get(f"{ROOT}/version", timeout=2)
+    resp = _session().get(_URL_VERSION, timeout=TIMEOUT)
     resp.raise_for_status()
     return resp.text
 
@@ -595,14 +997,18 @@ def _split_prefix_name(
     if not key:
         raise ValueError("icon key must be at least one string.")
     if len(key) == 1:
-        if ":" not in key[0]:
+        prefix, sep, name = key[0].partition(":")
+        if not sep:
             raise ValueError(
                 "Single-argument icon names must be in the format 'prefix:name'. "
                 f"Got {key[0]!r}"
             )
-        prefix, name = key[0].split(":", maxsplit=1)
+        # prefixes are interned, since they are used as keys in many lookups. (Names
+        # are not: they are only hashed, and interned strings may never be freed.)
+        prefix = sys.intern(prefix)
         return (prefix, (name,)) if allow_many else (prefix, name)
     prefix, *rest = key
+    prefix = sys.intern(prefix)
     if not allow_many:
         if len(rest) > 1:
             raise ValueError("icon key must be either 1 or 2 arguments.")
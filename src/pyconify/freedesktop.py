@@ -7,7 +7,7 @@ from pathlib import Path
 from tempfile import mkdtemp
 from typing import TYPE_CHECKING, Any
 
-from pyconify.api import svg
+from pyconify.api import _executor, svg
 
 if TYPE_CHECKING:
     from typing_extensions import Required, TypedDict, Unpack
@@ -168,15 +168,19 @@ def freedesktop_theme(
     theme_dir.mkdir(parents=True, exist_ok=True)
 
     dirs: set[str] = set()
+    # (destination, key, kwargs) for each icon
+    tasks: list[tuple[Path, str, Any]] = []
     for file_name, _svg_kwargs in icons.items():
         # determine which directory to put the icon in
-        file_key = file_name.lower().replace(".svg", "")
+        file_key = file_name if file_name.islower() else file_name.lower()
+        file_key = file_key.removesuffix(".svg")
         subdir = FREEDESKTOP_ICON_TO_DIR.get(file_key, MISC_DIR)
         dest = theme_dir / subdir
-        # create the directory if it doesn't exist
-        dest.mkdir(parents=True, exist_ok=True)
-        # add the directory to the list of directories
-        dirs.add(subdir)
+        if subdir not in dirs:
+            # create the directory (once) if it doesn't exist
+            dest.mkdir(parents=True, exist_ok=True)
+            # add the directory to the list of directories
+            dirs.add(subdir)
 
         # write the svg file
         if isinstance(_svg_kwargs, Mapping):
@@ -188,27 +192,34 @@ def freedesktop_theme(
             if not isinstance(_svg_kwargs, str):  # pragma: no cover
                 raise TypeError(f"Expected icon name or dict, got {type(_svg_kwargs)}")
             key, _kwargs = _svg_kwargs, kwargs
-        (dest / file_name).with_suffix(".svg").write_bytes(svg(key, **_kwargs))
+        tasks.append(((dest / file_name).with_suffix(".svg"), key, _kwargs))
+
+    # fetch the svgs concurrently, and write them as they arrive (in order)
+    svgs = _executor().map(lambda task: svg(task[1], **task[2]), tasks)
+    for (path, *_), svg_bytes in zip(tasks, svgs):
+        path.write_bytes(svg_bytes)
 
     sorted_dirs = sorted(dirs)
     index = theme_dir / "index.theme"
-    index_text = HEADER.format(
-        name=name,
-        comment=comment,
-        directories=",".join(map(str.lower, sorted_dirs)),
-    )
+    index_parts = [
+        HEADER.format(
+            name=name,
+            comment=comment,
+            directories=",".join(sorted_dirs),
+        )
+    ]
     for directory in sorted_dirs:
-        index_text += SUBDIR.format(directory=directory.lower())
+        index_parts.append(SUBDIR.format(directory=directory))
         if context := FREEDESKTOP_DIR_TO_CTX.get(directory):
-            index_text += f"Context={context}\n"
+            index_parts.append(f"Context={context}\n")
 
-    index.write_text(index_text)
+    index.write_text("".join(index_parts))
     return base
 
 
 # https://specifications.freedesktop.org/icon-naming-spec/icon-naming-spec-latest.html
 
-# mapping of directory name to Context
+# mapping of directory name to Context (all directory names are lowercase)
 FREEDESKTOP_DIR_TO_CTX: dict[str, str] = {
     "actions": "Actions",
     "animations": "Animations",
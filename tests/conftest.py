@@ -1,3 +1,5 @@
+import hashlib
+import os
 import shutil
 from collections.abc import Iterator
 from pathlib import Path
@@ -16,20 +18,36 @@ def no_cache(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
         yield
 
 
+def _cache_fingerprint(root: Path) -> bytes:
+    """Hash of the names, sizes and modification times of all files under `root`."""
+    h = hashlib.blake2b(digest_size=16)
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                h.update(entry.path.encode())
+                h.update(st.st_mtime_ns.to_bytes(8, "little"))
+                h.update(st.st_size.to_bytes(8, "little"))
+    return h.digest()
+
+
 @pytest.fixture(autouse=True)
 def ensure_no_cache() -> Iterator[None]:
     """Ensure that tests don't modify the user cache."""
     cache_dir = Path(get_cache_directory())
     existed = cache_dir.exists()
     if existed:
-        # get hash of cache directory
-        cache_hash = hash(tuple(cache_dir.rglob("*")))
+        cache_hash = _cache_fingerprint(cache_dir)
     try:
         yield
     finally:
         if existed:
             assert cache_dir.exists() == existed, "Cache directory was deleted"
-            if cache_hash != hash(tuple(cache_dir.rglob("*"))):
+            if cache_hash != _cache_fingerprint(cache_dir):
                 raise AssertionError("User Cache directory was modified")
         elif cache_dir.exists():
             shutil.rmtree(cache_dir, ignore_errors=True)
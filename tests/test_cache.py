@@ -1,6 +1,10 @@
+import os
+import shutil
+import time
 from collections.abc import Iterator
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
 import pytest
@@ -8,7 +12,13 @@ import requests
 
 import pyconify
 from pyconify import _cache, api
-from pyconify._cache import _SVGCache, clear_cache, get_cache_directory
+from pyconify._cache import (
+    _PackedSVGCache,
+    _SQLiteSVGCache,
+    _SVGCache,
+    clear_cache,
+    get_cache_directory,
+)
 
 
 def test_cache(tmp_path: Path) -> None:
@@ -22,14 +32,182 @@ def test_cache(tmp_path: Path) -> None:
     KEY, VAL = "testkey", b"testval"
     cache[KEY] = VAL
     assert cache[KEY] == VAL
-    assert cache.path.joinpath(f"{KEY}.svg").exists()
+    assert cache.path_for(KEY).exists()
+    assert cache.path_for(KEY).parent.parent == cache.path
     assert list(cache) == [KEY]
     assert KEY in cache
     del cache[KEY]
-    assert not cache.path.joinpath(f"{KEY}.svg").exists()
+    assert not cache.path_for(KEY).exists()
+    assert KEY not in cache
 
+    # membership is tracked in memory, refresh() picks up external changes
+    cache[KEY] = VAL
+    cache.path_for(KEY).unlink()
+    assert KEY in cache
+    cache.refresh()
+    assert KEY not in cache
+
+    with pytest.raises(KeyError):
+        cache["not a key"]
+
+
+def test_cache_latest(tmp_path: Path) -> None:
+    cache = _SVGCache(tmp_path)
+    cache["mdi_pen_100"] = b""
+    cache["mdi_pen_color_red_300"] = b""
+    assert cache.latest("mdi_pen") == "mdi_pen_100"
+    cache["mdi_pen_200"] = b""
+    assert cache.latest("mdi_pen") == "mdi_pen_200"
+    del cache["mdi_pen_200"]
+    assert cache.latest("mdi_pen") == "mdi_pen_100"
+    assert cache.latest("mdi_pencil") is None
+
+
+def test_cache_miss_keeps_stem_index(tmp_path: Path) -> None:
+    cache = _SVGCache(tmp_path)
+    for i in range(100):
+        cache[f"mdi_icon{i}_100"] = b""
+    assert cache.latest("mdi_icon0") == "mdi_icon0_100"
+
+    # misses (as in every uncached svg() call) must not rebuild the whole index
+    with patch.object(_cache, "_index_stem", wraps=_cache._index_stem) as index:
+        for i in range(50):
+            with pytest.raises(KeyError):
+                cache[f"mdi_missing{i}_100"]
+            assert cache.latest(f"mdi_missing{i}") is None
+    assert index.call_count == 0
+
+    # removing the newest key falls back to the next newest one
+    cache["mdi_icon0_50"] = b""
+    del cache["mdi_icon0_100"]
+    assert cache.latest("mdi_icon0") == "mdi_icon0_50"
+
+
+def test_cached_svg_path_fallback(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = _SVGCache(tmp_path)
+    monkeypatch.setattr(api, "svg_cache", lambda: cache)
+    cache["fa_home_1600000000"] = b""
+    # offline (no last_modified date): fall back to the newest cached svg
+    assert api._cached_svg_path(f"fa_home_{api.NO_LAST_MOD}")
+    # ... but not for dates that merely end in the same digits
+    assert api._cached_svg_path("fa_home_1700000000") is None
+
+
+def test_cache_index_threadsafe(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = _SVGCache(tmp_path)
+    # a large (pretend) index, so that rebuilding it takes a while
+    cache._known = {f"mdi_icon{i}_100" for i in range(30_000)}
+
+    def _work(i: int) -> None:
+        if i % 2:
+            cache[f"mdi_new{i}_100"] = b""
+        else:
+            cache._stems = None  # force latest() to rebuild the stem index
+            cache.latest("mdi_icon0")
+
+    # must not raise "RuntimeError: Set changed size during iteration"
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(_work, range(200)))
+
+
+def test_sqlite_cache(tmp_path: Path) -> None:
+    cache = _SQLiteSVGCache(tmp_path)
+    KEY, VAL = "bi_alarm_123", b"testval"
+    cache[KEY] = VAL
+    assert cache[KEY] == VAL
+    assert cache.db_path.exists()
+    assert list(cache) == [KEY]
+    assert len(cache) == 1
+    assert KEY in cache
+    del cache[KEY]
+    assert KEY not in cache
+
+    with pytest.raises(KeyError):
+        cache["not a key"]
+    with pytest.raises(KeyError):
+        del cache["not a key"]
+    cache.close()
+
+    # database errors are raised as KeyError (reads) or OSError (writes)
+    shutil.rmtree(tmp_path)  # as by clear_cache()
+    with pytest.raises(KeyError):
+        cache[KEY]
+    with pytest.raises(OSError):
+        cache[KEY] = VAL
+
+
+def test_sqlite_delete_stale(tmp_path: Path) -> None:
+    cache = _SQLiteSVGCache(tmp_path)
+    for key in ("fa_home_100", "fa_home_200", "fa-solid_home_100", "fax_home_100"):
+        cache[key] = b""
+    cache.delete_stale({"fa": 200})
+    assert set(cache) == {"fa_home_200", "fa-solid_home_100", "fax_home_100"}
+    cache.close()
+
+
+def test_packed_cache(tmp_path: Path) -> None:
+    cache = _PackedSVGCache(tmp_path)
+    cache["fa_home_100"] = b"old"
+    cache["fa_home_200"] = b"new"
+    cache["bi_alarm_100"] = b"alarm"
+    del cache["bi_alarm_100"]
+    assert cache["fa_home_200"] == b"new"
+    assert "bi_alarm_100" not in cache
     with pytest.raises(KeyError):
         cache["not a key"]
+    cache.close()
+
+    # the index is restored from disk
+    cache = _PackedSVGCache(tmp_path)
+    assert set(cache) == {"fa_home_100", "fa_home_200"}
+    # ... and the directory can't be opened by another process (or instance)
+    with pytest.raises(OSError, match="in use by another process"):
+        _PackedSVGCache(tmp_path)
+    size = cache.bin_path.stat().st_size
+
+    # stale entries are dropped and the data file compacted
+    cache.delete_stale({"fa": 200})
+    assert list(cache) == ["fa_home_200"]
+    assert cache["fa_home_200"] == b"new"
+    assert cache.bin_path.stat().st_size < size
+    cache.close()
+    cache = _PackedSVGCache(tmp_path)
+    assert list(cache) == ["fa_home_200"]
+    cache.close()
+
+
+@pytest.mark.parametrize("interrupted", [1, 2])
+def test_packed_cache_interrupted_compact(tmp_path: Path, interrupted: int) -> None:
+    cache = _PackedSVGCache(tmp_path)
+    cache["fa_home_100"] = b"old"
+    cache["fa_home_200"] = b"new"
+    del cache["fa_home_100"]
+
+    # stop the compaction at the n-th file replacement (as at interpreter exit)
+    replace, calls = os.replace, []
+
+    def _replace(*args: Any) -> None:
+        calls.append(args)
+        if len(calls) == interrupted:
+            raise SystemExit
+        replace(*args)
+
+    with patch.object(os, "replace", _replace), suppress(SystemExit):
+        cache.compact()
+    cache.close()
+
+    cache = _PackedSVGCache(tmp_path)
+    assert dict(cache) == {"fa_home_200": b"new"}
+    assert {p.name for p in tmp_path.iterdir()} == {
+        "svgs.idx",
+        "svgs.lock",
+        cache.bin_path.name,
+    }
+    cache.close()
 
 
 def test_cache_dir(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -44,6 +222,47 @@ def test_delete_stale() -> None:
     assert not cache
 
 
+def test_delete_stale_files(tmp_path: Path) -> None:
+    cache = _SVGCache(tmp_path)
+    cache["fa_home_100"] = b""
+    cache["fa_home_color_red_200"] = b""
+    cache["bi_alarm_100"] = b""
+    cache.delete_stale({"fa": 200, "bi": 50})
+    assert set(cache) == {"fa_home_color_red_200", "bi_alarm_100"}
+
+
+def test_remove_legacy_files(tmp_path: Path) -> None:
+    # svgs stored by older versions, outside of the bucket sub-directories
+    legacy = tmp_path / "bi_alarm_1700000000.svg"
+    legacy.write_bytes(b"<svg/>")
+    cache = _SVGCache(tmp_path)
+    cache["bi_alarm_100"] = b"<svg/>"
+    # a fresh sweep record: no network request is needed
+    _cache._write_last_modified(tmp_path, {})
+    _cache._delete_stale_svgs_safe(cache)
+    assert not legacy.exists()
+    assert list(cache) == ["bi_alarm_100"]
+
+
+def test_delete_stale_only_when_changed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = _SVGCache(tmp_path)
+    monkeypatch.setattr(api, "last_modified", lambda: {"fa": 200})
+    _cache._delete_stale_svgs(cache)
+    assert _cache._read_last_modified(tmp_path) == {"fa": 200}
+
+    # nothing changed upstream since the last sweep: the stale file is left alone
+    cache["fa_home_100"] = b""
+    _cache._delete_stale_svgs(cache)
+    assert "fa_home_100" in cache
+
+    monkeypatch.setattr(api, "last_modified", lambda: {"fa": 300})
+    _cache._delete_stale_svgs(cache)
+    assert "fa_home_100" not in cache
+    assert _cache._read_last_modified(tmp_path) == {"fa": 300}
+
+
 @pytest.fixture
 def tmp_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
     cache = tmp_path / "cache"
@@ -52,6 +271,16 @@ def tmp_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]
     yield cache
 
 
+@pytest.mark.usefixtures("tmp_cache")
+def test_svg_cache_threadsafe() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    # concurrent first calls must all get the same cache
+    with ThreadPoolExecutor(8) as pool:
+        caches = list(pool.map(lambda _: _cache.svg_cache(), range(32)))
+    assert all(cache is caches[0] for cache in caches)
+
+
 @pytest.mark.usefixtures("tmp_cache")
 def test_tmp_svg_with_fixture() -> None:
     """Test that we can set the cache directory to tmp_path with monkeypatch."""
@@ -59,15 +288,19 @@ def test_tmp_svg_with_fixture() -> None:
     assert str(result3).startswith(str(_cache.get_cache_directory()))
 
 
+# memoized objects in api that must survive internet_offline()
+KEEP_CACHED = {"_session", "_executor", "_tmp_dir"}
+
+
 @contextmanager
 def internet_offline() -> Iterator[None]:
     """Simulate an offline internet connection."""
     session = api._session()
     with patch.object(session, "get") as mock:
         mock.side_effect = requests.ConnectionError("No internet connection.")
-        # clear functools caches...
-        for val in vars(pyconify).values():
-            if hasattr(val, "cache_clear"):
+        # clear functools caches (but keep the patched session)...
+        for name, val in vars(api).items():
+            if name not in KEEP_CACHED and hasattr(val, "cache_clear"):
                 val.cache_clear()
         yield
 
@@ -95,4 +328,103 @@ def test_cache_used_offline() -> None:
 def test_cache_loaded_offline(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(_cache, "_SVG_CACHE", None)
     with internet_offline():
-        assert isinstance(_cache.svg_cache(), _cache._SVGCache)
+        cache = _cache.svg_cache()
+        assert isinstance(cache, _cache._TieredCache)
+        assert isinstance(cache.backend, _cache._SVGCache)
+
+
+@pytest.mark.usefixtures("tmp_cache")
+def test_last_modified_snapshot(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = _cache.svg_cache()
+    directory = cache.backend.path
+    _cache._write_last_modified(directory, {"fa": 200})
+    monkeypatch.setattr(_cache, "_LAST_MODIFIED_SNAPSHOT", None)
+    assert _cache.last_modified_snapshot(cache) == {"fa": 200}
+
+    # an outdated snapshot is ignored
+    old = time.time() - _cache.LAST_MODIFIED_TTL - 1
+    os.utime(directory / _cache.LAST_MODIFIED_FILE, (old, old))
+    monkeypatch.setattr(_cache, "_LAST_MODIFIED_SNAPSHOT", None)
+    assert _cache.last_modified_snapshot(cache) is None
+
+
+@pytest.mark.usefixtures("tmp_cache")
+def test_last_modified_snapshot_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = _cache.svg_cache()
+    _cache._write_last_modified(cache.backend.path, {"fa": 100})
+    monkeypatch.setattr(_cache, "_LAST_MODIFIED_SNAPSHOT", None)
+    assert _cache.last_modified_snapshot(cache) == {"fa": 100}
+
+    # the snapshot outlives its TTL in a long-running process...
+    monkeypatch.setattr(api, "last_modified", lambda: {"fa": 200})
+    now = time.time() + 3 * _cache.LAST_MODIFIED_TTL
+    monkeypatch.setattr(time, "time", lambda: now)
+    sweeps = []
+    monkeypatch.setattr(_cache, "_start_stale_sweep", sweeps.append)
+    assert _cache.last_modified_snapshot(cache) is None
+    assert api._svg_keys(("fa:home",))[2].endswith("_200")
+    # ... and is refreshed by a (background) sweep
+    assert sweeps == [cache.backend]
+    _cache._delete_stale_svgs(cache.backend)
+    assert _cache.last_modified_snapshot(cache) == {"fa": 200}
+
+
+def test_tiered_cache(tmp_path: Path) -> None:
+    backend = _SVGCache(tmp_path)
+    cache = _cache._TieredCache(backend, maxbytes=10)
+    cache["a_1"] = b"12345"
+    cache["b_1"] = b"abcde"
+    assert cache["a_1"] == b"12345"
+    assert backend["b_1"] == b"abcde"
+
+    # exceeding the byte budget evicts the least recently used entry from memory
+    cache["c_1"] = b"ABCDE"
+    assert set(cache._memory) == {"a_1", "c_1"}
+    # ... but it is still available from the backend
+    assert cache["b_1"] == b"abcde"
+    assert set(cache._memory) == {"c_1", "b_1"}
+    assert len(cache) == 3
+
+    # identical values share memory, and only count once towards the budget
+    cache["e_1"] = backend["b_1"]  # a new bytes object, equal to b"abcde"
+    assert cache._memory["e_1"] is cache._memory["b_1"]
+    assert set(cache._memory) == {"c_1", "b_1", "e_1"}
+    assert cache._nbytes == 10
+
+    del cache["b_1"]
+    assert "b_1" not in cache
+    assert "b_1" not in backend
+
+    # deferred writes are visible immediately, and in the backend after flush()
+    cache.set_deferred("d_1", b"123")
+    assert cache["d_1"] == b"123"
+    cache.flush()
+    assert backend["d_1"] == b"123"
+
+
+def test_ttl_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    @_cache.ttl_cache(ttl=10, maxsize=2)
+    def func(x: int) -> int:
+        calls.append(x)
+        return x
+
+    assert func(1) == func(1) == 1
+    assert calls == [1]
+
+    # entries expire after ttl seconds
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    func(1)
+    assert calls == [1, 1]
+
+    # ... and the least recently used entry is evicted beyond maxsize
+    func(2)
+    func(3)
+    func(1)
+    assert calls == [1, 1, 2, 3, 1]
+
+    func.cache_clear()  # type: ignore[attr-defined]
+    func(3)
+    assert calls == [1, 1, 2, 3, 1, 3]
@@ -1,8 +1,13 @@
+import os
+import time
+from collections.abc import Iterator
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 
 import pyconify
+from pyconify import _cache
 
 
 def test_collections() -> None:
@@ -30,6 +35,15 @@ def test_icon_data() -> None:
         pyconify.icon_data("not", "found")
 
 
+def test_icon_data_chunked(monkeypatch: pytest.MonkeyPatch) -> None:
+    # force a separate request for each icon
+    monkeypatch.setattr(pyconify.api, "MAX_ICONS_QUERY_LEN", 1)
+    result = pyconify.icon_data("bi", "alarm", "alarm-fill", "not-an-icon")
+    assert result["prefix"] == "bi"
+    assert {"alarm", "alarm-fill"} <= set(result["icons"])
+    assert result["not_found"] == ["not-an-icon"]
+
+
 @pytest.mark.usefixtures("no_cache")
 def test_svg() -> None:
     result = pyconify.svg("bi", "alarm", rotate=90, box=True)
@@ -40,6 +54,45 @@ def test_svg() -> None:
         pyconify.svg("not", "found")
 
 
+@pytest.mark.usefixtures("no_cache")
+@pytest.mark.parametrize("status", [304, 200])
+def test_svg_revalidates_outdated_cache(
+    status: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # an svg cached before the icon set was last modified (and before the dates
+    # recorded by the last stale-svg sweep became outdated)
+    monkeypatch.setattr(pyconify.api, "last_modified", lambda: {"bi": 100})
+    old_key = pyconify.api._svg_keys(("bi:alarm",))[2]
+    cache = pyconify.api.svg_cache()
+    cache[old_key] = b"<svg>old</svg>"
+    _cache._write_last_modified(cache.path, {"bi": 100})
+    old = time.time() - _cache.LAST_MODIFIED_TTL - 1
+    os.utime(cache.path / _cache.LAST_MODIFIED_FILE, (old, old))
+
+    monkeypatch.setattr(pyconify.api, "last_modified", lambda: {"bi": 200})
+    resp = Mock(status_code=status, content=b"<svg>new</svg>")
+    get = Mock(return_value=resp)
+    monkeypatch.setattr(pyconify.api, "_session", lambda: Mock(get=get))
+
+    # the old svg is found without scanning the cache
+    monkeypatch.setattr(cache, "latest", Mock(side_effect=AssertionError))
+    result = pyconify.svg("bi:alarm")
+    # the old svg is only reused if it wasn't modified since it was cached
+    assert result == (b"<svg>old</svg>" if status == 304 else b"<svg>new</svg>")
+    assert "If-Modified-Since" in get.call_args.kwargs["headers"]
+    new_key = pyconify.api._svg_keys(("bi:alarm",))[2]
+    assert cache[new_key] == result
+
+
+@pytest.mark.usefixtures("no_cache")
+def test_svg_many() -> None:
+    result = pyconify.svg_many(["bi:alarm", ("bi", "alarm-fill")], color="red")
+    assert result == [
+        pyconify.svg("bi:alarm", color="red"),
+        pyconify.svg("bi", "alarm-fill", color="red"),
+    ]
+
+
 @pytest.mark.usefixtures("no_cache")
 def test_tmp_svg(tmp_path: Path) -> None:
     result1 = pyconify.svg_path("bi", "alarm", rotate=90, box=True)
@@ -54,6 +107,29 @@ def test_tmp_svg(tmp_path: Path) -> None:
     assert result2.read_bytes() == pyconify.svg("bi", "alarm", rotate=90, box=True)
 
 
+def test_svg_path_cache_clear() -> None:
+    pyconify.svg_path.cache_clear()  # type: ignore[attr-defined]
+    assert pyconify.svg_path.cache_info().currsize == 0  # type: ignore[attr-defined]
+
+
+def test_tmp_svg_content_addressed(tmp_path: Path) -> None:
+    path1 = pyconify.api._write_tmp_svg("pyconify_x", str(tmp_path), [b"<svg/>"])
+    path2 = pyconify.api._write_tmp_svg("pyconify_x", str(tmp_path), [b"<sv", b"g/>"])
+    assert path1 == path2
+    assert path1.read_bytes() == b"<svg/>"
+    assert list(tmp_path.iterdir()) == [path1]
+
+
+def test_tmp_svg_interrupted(tmp_path: Path) -> None:
+    def _chunks() -> Iterator[bytes]:
+        yield b"<svg"
+        raise ConnectionError("connection lost")
+
+    with pytest.raises(ConnectionError):
+        pyconify.api._write_tmp_svg("pyconify_x", str(tmp_path), _chunks())
+    assert not list(tmp_path.iterdir())
+
+
 def test_css() -> None:
     result = pyconify.css("bi", "alarm")
     assert result.startswith(".icon--bi")
@@ -81,6 +157,23 @@ def test_css() -> None:
         pyconify.css("bi:not-an-icon,nor-this")
 
 
+def test_css_warning_points_at_caller(monkeypatch: pytest.MonkeyPatch) -> None:
+    resp = Mock(status_code=200, text="/* Could not find icon: nope */\n")
+    monkeypatch.setattr(
+        pyconify.api, "_session", lambda: Mock(get=Mock(return_value=resp))
+    )
+    with pytest.warns(UserWarning, match="nope") as record:
+        pyconify.css("bi:nope")
+    assert record[0].filename == __file__
+
+
+def test_session_retries() -> None:
+    retry = pyconify.api._session().get_adapter(pyconify.api.ROOT).max_retries
+    assert retry.total == 3
+    # a throttled response must not make the caller wait for its Retry-After
+    assert not retry.respect_retry_after_header
+
+
 def test_last_modified() -> None:
     assert isinstance(pyconify.last_modified("bi")["bi"], int)
 
@@ -112,3 +205,16 @@ def test_search() -> None:
 
 def test_iconify_version() -> None:
     assert isinstance(pyconify.iconify_version(), str)
+
+
+@pytest.mark.usefixtures("no_cache")
+def test_svg_keys_normalized() -> None:
+    key = pyconify.api._svg_keys(("bi", "alarm"), color="#ABC", rotate=90)[2]
+    assert pyconify.api._svg_keys(("bi:alarm",), color="#abc", rotate="90deg")[2] == key
+    flip = pyconify.api._svg_keys(("bi:alarm",), flip="horizontal,vertical")[2]
+    assert pyconify.api._svg_keys(("bi:alarm",), flip="vertical,horizontal")[2] == flip
+    plain = pyconify.api._svg_keys(("bi:alarm",))[2]
+    assert pyconify.api._svg_keys(("bi:alarm",), box=False)[2] == plain
+
+    with pytest.raises(ValueError, match="Invalid flip"):
+        pyconify.api._svg_keys(("bi:alarm",), flip="diagonal")  # type: ignore